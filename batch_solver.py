@@ -0,0 +1,226 @@
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+from typing import Callable, Optional, TextIO
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # stdout carries JSON only
+
+from grid import Grid
+from landmarks import LandmarkTable
+from map_generators import read_map
+from searching_algorithms import *
+
+ALGORITHMS: dict[str, Callable[..., bool]] = {
+    'bfs': bfs,
+    'dfs': dfs,
+    'dls': dls,
+    'ucs': ucs,
+    'greedy': greedy_best_first,
+    'astar': astar,
+    'iddfs': iddfs,
+    'ida': ida,
+    'sma': sma_star,
+    'ara': ara_star,
+}
+
+# algorithms that also accept several start and/or end cells
+MULTI_ALGORITHMS: dict[str, Callable[..., Optional[Spot]]] = {
+    'bfs': bfs_multi,
+    'ucs': ucs_multi,
+    'astar': astar_multi,
+}
+
+
+HEURISTICS: dict[str, Callable[[tuple[int, int], tuple[int, int]], float]] = {
+    'manhattan': h_manhattan_distance,
+    'euclidean': h_euclidian_distance,
+}
+
+
+class QueryError(ValueError):
+    pass
+
+
+def no_draw() -> None:
+    pass
+
+
+class BatchSolver:
+    """
+    Answers path queries against one map. The grid, its neighbor lists and its search
+    workspace are built once and shared by every query.
+    """
+
+    def __init__(self, rows: int, cols: int, cells: bytes, landmarks: int = 8,
+                 landmark_path: Optional[str] = None):
+        """
+        Args:
+            rows (int): The number of rows of the map.
+            cols (int): The number of columns of the map.
+            cells (bytes): The flat map (1 = barrier, 0 = free), as returned by read_map.
+            landmarks (int): The number of landmarks of the 'alt' heuristic.
+            landmark_path (str | None): Where the landmark tables are persisted between runs.
+        """
+        self.grid = Grid(None, rows, cols, cols, rows)
+        self.grid.load_barriers(cells)
+        self.grid.update_neighbors()
+        self.landmarks = landmarks
+        self.landmark_path = landmark_path
+        self._alt: Optional[LandmarkTable] = None
+
+    def heuristic(self, name) -> Callable[[tuple[int, int], tuple[int, int]], float]:
+        if name == 'alt':
+            # built (or loaded from landmark_path) on first use, then kept for the whole stream
+            if self._alt is None:
+                self._alt = self.grid.landmarks(self.landmarks, self.landmark_path)
+            return self._alt.search_heuristic()  # landmarks are picked again for every query
+        if name not in HEURISTICS:
+            raise QueryError(f"unknown heuristic {name!r}, expected one of {sorted(HEURISTICS) + ['alt']}")
+        return HEURISTICS[name]
+
+    def spot(self, cell) -> Spot:
+        if not (isinstance(cell, list) and len(cell) == 2 and all(type(v) is int for v in cell)):
+            raise QueryError(f"a cell must be [row, col], got {cell!r}")
+        row, col = cell
+        if not (0 <= row < self.grid.rows and 0 <= col < self.grid.cols):
+            raise QueryError(f"cell {cell} is outside the {self.grid.rows}x{self.grid.cols} map")
+        spot = self.grid.grid[row][col]
+        if spot.is_barrier():
+            raise QueryError(f"cell {cell} is a barrier")
+        return spot
+
+    def spots(self, cells) -> list[Spot]:
+        """A single [row, col] or a list of them."""
+        if isinstance(cells, list) and cells and isinstance(cells[0], list):
+            return [self.spot(cell) for cell in cells]
+        return [self.spot(cells)]
+
+    def solve(self, query: dict, progress: Optional[Callable[[dict], None]] = None) -> dict:
+        """
+        Answer one query.
+        Args:
+            query (dict): {"algorithm": name, "start": cell(s), "end": cell(s)} plus optional
+                "id" (echoed back), "heuristic" ("manhattan", "euclidean" or "alt") and
+                "options" (extra keyword arguments of the algorithm, e.g. {"max_nodes": 5000} for sma).
+            progress (callable | None): Called with {"id", "final": False, "path", "cost", "bound"}
+                for every intermediate path of an anytime algorithm (ara).
+        Returns:
+            dict: {"id", "found", "path", "cost", "stats"}; stats also has "bound" (cost <= bound * optimal)
+                for anytime algorithms.
+        """
+        if not isinstance(query, dict):
+            raise QueryError("a query must be a JSON object")
+        name = query.get('algorithm', 'astar')
+        if name not in ALGORITHMS:
+            raise QueryError(f"unknown algorithm {name!r}, expected one of {sorted(ALGORITHMS)}")
+        if 'start' not in query or 'end' not in query:
+            raise QueryError("a query needs 'start' and 'end'")
+        starts = self.spots(query['start'])
+        ends = self.spots(query['end'])
+        options = query.get('options', {})
+        if not isinstance(options, dict):
+            raise QueryError("'options' must be a JSON object")
+        for key, field in (('heuristic', 'heuristic'), ('on_solution', 'progress')):
+            if key in options:
+                raise QueryError(f"{key!r} cannot be given in 'options', use the query's {field!r} field")
+        if 'heuristic' in query:
+            options = dict(options, heuristic=self.heuristic(query['heuristic']))
+
+        if len(starts) == 1 and len(ends) == 1:
+            algorithm, start, end = ALGORITHMS[name], starts[0], ends[0]
+        elif name in MULTI_ALGORITHMS:
+            algorithm, start, end = MULTI_ALGORITHMS[name], starts, ends
+        else:
+            raise QueryError(f"{name} takes a single start and end, expected one of "
+                             f"{sorted(MULTI_ALGORITHMS)} for several")
+        try:
+            inspect.signature(algorithm).bind(no_draw, self.grid, start, end, **options)
+        except TypeError as e:
+            raise QueryError(f"bad options for {name}: {e}") from None
+
+        cols = self.grid.cols
+        if progress is not None and 'on_solution' in inspect.signature(algorithm).parameters:
+            def on_solution(path: list[Spot], cost: float, bound: float) -> None:
+                progress({'id': query.get('id'), 'final': False, 'path': [list(spot.get_position()) for spot in path],
+                          'cost': cost, 'bound': bound})
+            options = dict(options, on_solution=on_solution)
+
+        ws = self.grid.workspace
+        t0 = time.perf_counter()
+        try:
+            found = bool(algorithm(no_draw, self.grid, start, end, **options))  # multi variants return a Spot or None
+        except RecursionError:
+            raise QueryError(f"{name} recursed too deep for this map") from None
+        except (ValueError, TypeError) as e:
+            # option values are only type-checked by the algorithm itself, e.g. {"max_nodes": 0} or {"limit": "x"}
+            raise QueryError(f"bad options for {name}: {e}") from None
+        elapsed = time.perf_counter() - t0
+
+        path = [list(divmod(i, cols)) for i in ws.path] if found else []
+        stats = {'expanded': ws.expanded, 'time_ms': round(elapsed * 1000, 3)}
+        if found and ws.bound is not None:
+            stats['bound'] = ws.bound
+        return {
+            'id': query.get('id'),
+            'found': found,
+            'path': path,
+            'cost': len(path) - 1 if found else None,
+            'stats': stats,
+        }
+
+
+def run(solver: BatchSolver, lines: TextIO, out: TextIO) -> int:
+    """
+    Answer a stream of JSON-lines queries, one JSON line per query, in input order.
+    The input is consumed one line at a time, so memory use does not grow with the stream.
+    A query with "progress": true to an anytime algorithm also gets a line (with "final": false)
+    for every intermediate path, written as soon as it is found.
+    Returns:
+        int: The number of queries that failed.
+    """
+    def write(answer: dict) -> None:
+        out.write(json.dumps(answer, separators=(',', ':')))
+        out.write('\n')
+        out.flush()
+
+    failures = 0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        query = None
+        try:
+            query = json.loads(line)
+            answer = solver.solve(query, write if isinstance(query, dict) and query.get('progress') else None)
+        except (json.JSONDecodeError, QueryError) as e:
+            failures += 1
+            answer = {'id': query.get('id') if isinstance(query, dict) else None,
+                      'line': number, 'error': str(e)}
+        write(answer)
+    return failures
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Answer JSON-lines path queries against a '#'/'.' map file.")
+    parser.add_argument('map', help="map file, as written by map_generators.py")
+    parser.add_argument('queries', nargs='?', default='-', help="JSON-lines query file (default: stdin)")
+    parser.add_argument('--landmarks', type=int, default=8, help="number of landmarks of the 'alt' heuristic")
+    args = parser.parse_args(argv)
+
+    rows, cols, cells = read_map(args.map)
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * rows * cols + 1000))  # for dls/iddfs/ida
+    # landmark tables are saved next to the map and reused until the map changes
+    solver = BatchSolver(rows, cols, cells, args.landmarks, args.map + '.alt')
+    if args.queries == '-':
+        failures = run(solver, sys.stdin, sys.stdout)
+    else:
+        with open(args.queries) as f:
+            failures = run(solver, f, sys.stdout)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+from collections import deque
+
+
+class ComponentIndex:
+    """
+    Connected-component labelling of the free cells of a grid, kept up to date as barriers
+    are added and removed, so that "is end reachable from start?" is answered in O(1)
+    (amortized) before any search runs.
+
+    labels[i] is the label of cell i (-1 for a barrier); two cells are connected when their
+    labels have the same root in a union-find over labels. Removing a barrier unions the labels
+    around it; adding one may split a component, which is detected by searching outwards from
+    its free neighbors in lockstep and stopping as soon as they all meet again.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        """
+        Create the index of an empty (barrier-free) grid.
+        Args:
+            rows (int): The number of rows of the grid.
+            cols (int): The number of columns of the grid.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.build(bytes(rows * cols))
+
+    def build(self, cells: bytes) -> None:
+        """
+        Label every component from scratch, in one pass over the map.
+        Args:
+            cells (bytes): The flat map (1 = barrier, 0 = free), indexed by row * cols + col.
+        Returns:
+            None
+        """
+        n = self.rows * self.cols
+        if len(cells) != n:
+            raise ValueError(f"expected {n} cells, got {len(cells)}")
+        self.walls = bytearray(cells)
+        if n and self.walls.count(0) == n:
+            # no barriers: a single component, no need to flood it cell by cell
+            self.labels = [0] * n
+            self.parent: list[int] = [0]
+            return
+        self.labels = [-1] * n
+        self.parent = []
+        walls, labels = self.walls, self.labels
+        for i in range(n):
+            if walls[i] or labels[i] >= 0:
+                continue
+            label = self._new_label()
+            labels[i] = label
+            frontier = [i]
+            while frontier:
+                next_frontier = []
+                for j in frontier:
+                    for k in self._free_neighbors(j):
+                        if labels[k] < 0:
+                            labels[k] = label
+                            next_frontier.append(k)
+                frontier = next_frontier
+
+    def _new_label(self) -> int:
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def _find(self, label: int) -> int:
+        parent = self.parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]  # path halving
+            label = parent[label]
+        return label
+
+    def _free_neighbors(self, i: int) -> list[int]:
+        cols, walls = self.cols, self.walls
+        c = i % cols
+        out = []
+        if c > 0 and not walls[i - 1]:
+            out.append(i - 1)
+        if c < cols - 1 and not walls[i + 1]:
+            out.append(i + 1)
+        if i >= cols and not walls[i - cols]:
+            out.append(i - cols)
+        if i + cols < len(walls) and not walls[i + cols]:
+            out.append(i + cols)
+        return out
+
+    def component(self, i: int) -> int:
+        """
+        Gets the component id of cell i.
+        Returns:
+            int: An id shared by all cells of the component, or -1 for a barrier.
+        """
+        label = self.labels[i]
+        return -1 if label < 0 else self._find(label)
+
+    def connected(self, i: int, j: int) -> bool:
+        """
+        Checks if there is a path between cells i and j.
+        Returns:
+            bool: True if both cells are free and in the same component, False otherwise.
+        """
+        a, b = self.labels[i], self.labels[j]
+        return a >= 0 and b >= 0 and self._find(a) == self._find(b)
+
+    def remove_barrier(self, i: int) -> None:
+        """
+        Mark cell i as free and merge the components it now joins.
+        """
+        if not self.walls[i]:
+            return
+        self.walls[i] = 0
+        label = self._new_label()
+        self.labels[i] = label
+        for k in self._free_neighbors(i):
+            a, b = self._find(label), self._find(self.labels[k])
+            if a != b:
+                self.parent[b] = a
+
+    def add_barrier(self, i: int) -> None:
+        """
+        Mark cell i as a barrier and relabel whatever part of its component it cuts off.
+        """
+        if self.walls[i]:
+            return
+        self.walls[i] = 1
+        self.labels[i] = -1
+        seeds = self._free_neighbors(i)
+        if len(seeds) <= 1:
+            return  # a dead end: nothing to split
+
+        # one search per seed, run in lockstep; searches that meet are merged into one group
+        group = list(range(len(seeds)))
+
+        def find(g: int) -> int:
+            while group[g] != g:
+                g = group[g]
+            return g
+
+        owner = {s: g for g, s in enumerate(seeds)}
+        queues = {g: deque([s]) for g, s in enumerate(seeds)}
+        while len(queues) > 1:
+            for g in list(queues):
+                if g not in queues:
+                    continue  # merged into another group during this round
+                queue = queues[g]
+                if not queue:
+                    # this group is cut off from the others: it becomes a component of its own
+                    label = self._new_label()
+                    for cell, owner_group in owner.items():
+                        if find(owner_group) == g:
+                            self.labels[cell] = label
+                    del queues[g]
+                    if len(queues) == 1:
+                        break
+                    continue
+                cell = queue.popleft()
+                for k in self._free_neighbors(cell):
+                    other = owner.get(k)
+                    if other is None:
+                        owner[k] = g
+                        queue.append(k)
+                        continue
+                    h = find(other)
+                    if h != g:
+                        # two searches met: same component, continue as a single search
+                        group[h] = g
+                        queue.extend(queues.pop(h))
+        # the last group still running keeps the old label, as does everything it did not reach
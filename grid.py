@@ -1,5 +1,8 @@
 from utils import *
 from spot import Spot
+from search_workspace import SearchWorkspace
+from landmarks import LandmarkTable
+from components import ComponentIndex
 import pygame
 
 class Grid:
@@ -11,6 +14,12 @@ class Grid:
         self.height = height
         self.offset_x = offset_x
         self.grid = self._make_grid()
+        self.spots = [spot for row in self.grid for spot in row]  # spots[row * cols + col]
+        self.workspace = SearchWorkspace(rows, cols)
+        # barriers must be changed through make_barrier / clear_barrier / load_barriers / reset
+        # to keep these current: each of them drops the landmark tables
+        self._landmarks: LandmarkTable | None = None
+        self.components = ComponentIndex(rows, cols)
 
     def _make_grid(self) -> list[list[Spot]]:
         """
@@ -24,7 +33,7 @@ class Grid:
         for i in range(self.rows):
             grid.append([])
             for j in range(self.cols):
-                spot = Spot(i, j, spot_width, spot_height, self.rows)
+                spot = Spot(i, j, spot_width, spot_height, self.rows, self.cols)
                 grid[i].append(spot)
         return grid
 
@@ -88,3 +97,92 @@ class Grid:
         for row in self.grid:
             for spot in row:
                 spot.reset()
+        self._landmarks = None
+        self.components.build(bytes(self.rows * self.cols))
+
+    def make_barrier(self, spot: Spot) -> None:
+        """
+        Turn a spot into a barrier and update the connected components.
+        Args:
+            spot (Spot): The spot to turn into a barrier.
+        Returns:
+            None
+        """
+        if not spot.is_barrier():
+            self._landmarks = None
+        spot.make_barrier()
+        self.components.add_barrier(spot.index)
+
+    def clear_barrier(self, spot: Spot) -> None:
+        """
+        Reset a spot (barrier or not) to an empty one and update the connected components.
+        Args:
+            spot (Spot): The spot to reset.
+        Returns:
+            None
+        """
+        if spot.is_barrier():
+            self._landmarks = None
+        spot.reset()
+        self.components.remove_barrier(spot.index)
+
+    def connected(self, a: Spot, b: Spot) -> bool:
+        """
+        Checks in O(1) if there is a path between two spots, without searching.
+        Returns:
+            bool: True if both spots are free and in the same connected component, False otherwise.
+        """
+        return self.components.connected(a.index, b.index)
+
+    def update_neighbors(self) -> None:
+        """
+        Recompute the neighbor lists of every spot (call after the barriers change).
+        """
+        for spot in self.spots:
+            spot.update_neighbors(self.grid)
+
+    def landmarks(self, k: int = 8, path: str | None = None) -> LandmarkTable:
+        """
+        Gets the ALT landmark tables of the grid. They are kept until the barriers change (or k does),
+        so asking again is O(1); a matching copy saved at path is loaded instead of recomputed.
+        Pass table.search_heuristic() as the heuristic of astar, ida or greedy_best_first.
+        Args:
+            k (int): The number of landmarks.
+            path (str | None): A file to persist the tables in, next to the map file.
+        Returns:
+            LandmarkTable: The landmark tables of the grid.
+        """
+        if self._landmarks is not None and self._landmarks.k == k:
+            return self._landmarks
+        self._landmarks = LandmarkTable.for_map(self.barrier_cells(), self.rows, self.cols, k,
+                                                path=path, cached=self._landmarks)
+        return self._landmarks
+
+    def barrier_cells(self) -> bytearray:
+        """
+        Snapshot the barriers of the grid as a flat map.
+        Returns:
+            bytearray: One byte per spot, indexed by row * cols + col (1 = barrier, 0 = free).
+        """
+        return bytearray(1 if spot.is_barrier() else 0 for row in self.grid for spot in row)
+
+    def load_barriers(self, cells: bytes) -> None:
+        """
+        Replace the contents of the grid with a flat map, e.g. one made by map_generators.
+        Every spot is reset and the ones marked 1 become barriers.
+        Args:
+            cells (bytes): One byte per spot, indexed by row * cols + col (1 = barrier, 0 = free).
+        Returns:
+            None
+        """
+        if len(cells) != self.rows * self.cols:
+            raise ValueError(f"expected {self.rows * self.cols} cells, got {len(cells)}")
+        it = iter(cells)
+        for row in self.grid:
+            for spot, wall in zip(row, it):
+                if wall:
+                    spot.make_barrier()
+                else:
+                    spot.reset()
+        self._landmarks = None
+        self.components.build(cells)
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+from array import array
+from typing import Callable, Optional
+
+INF = float('inf')
+FORMAT_VERSION = 1
+
+
+def fingerprint(cells: bytes) -> str:
+    """
+    Gets a short hash of a flat map, used to tell whether saved tables still match the grid.
+    """
+    return hashlib.blake2b(bytes(cells), digest_size=16).hexdigest()
+
+
+def bfs_distances(cells: bytes, rows: int, cols: int, source: int) -> array:
+    """
+    Distances (in steps) from one cell to every cell of a flat map.
+    Args:
+        cells (bytes): The flat map (1 = barrier, 0 = free), indexed by row * cols + col.
+        rows (int): The number of rows of the map.
+        cols (int): The number of columns of the map.
+        source (int): The flat index of the source cell.
+    Returns:
+        array: One signed int per cell, -1 for barriers and unreachable cells.
+    """
+    n = rows * cols
+    dist = array('i', [-1]) * n
+    dist[source] = 0
+    frontier = [source]
+    d = 0
+    last_col = cols - 1
+    while frontier:
+        d += 1
+        next_frontier = []
+        append = next_frontier.append
+        for i in frontier:
+            c = i % cols
+            if c and not cells[i - 1] and dist[i - 1] < 0:
+                dist[i - 1] = d
+                append(i - 1)
+            if c < last_col and not cells[i + 1] and dist[i + 1] < 0:
+                dist[i + 1] = d
+                append(i + 1)
+            j = i - cols
+            if j >= 0 and not cells[j] and dist[j] < 0:
+                dist[j] = d
+                append(j)
+            j = i + cols
+            if j < n and not cells[j] and dist[j] < 0:
+                dist[j] = d
+                append(j)
+        frontier = next_frontier
+    return dist
+
+
+class LandmarkTable:
+    """
+    Precomputed distances from K landmark cells to every cell, giving the ALT
+    (A*, Landmarks, Triangle inequality) lower bound |d(L, a) - d(L, b)| <= d(a, b).
+    """
+
+    # how many of the landmarks a query actually consults: the ones with the tightest bound at its start
+    ACTIVE = 3
+
+    def __init__(self, rows: int, cols: int, k: int, landmarks: list[int], tables: list[array], digest: str):
+        """
+        Args:
+            rows (int): The number of rows of the map.
+            cols (int): The number of columns of the map.
+            k (int): The number of landmarks asked for (small maps may end up with fewer).
+            landmarks (list[int]): The flat indices of the landmarks.
+            tables (list[array]): tables[k][i] is the distance from landmarks[k] to cell i (-1 if unreachable).
+            digest (str): The fingerprint of the map the tables were computed on.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.landmarks = landmarks
+        self.tables = tables
+        self.fingerprint = digest
+        # goal -> its active (table, distance to goal), for the current search
+        self._active: dict[int, list[tuple[array, int]]] = {}
+
+    @classmethod
+    def build(cls, cells: bytes, rows: int, cols: int, k: int = 8) -> "LandmarkTable":
+        """
+        Pick k landmarks by farthest-point selection and compute their distance tables.
+        Each new landmark is the free cell farthest from the landmarks chosen so far; a cell
+        none of them can reach counts as infinitely far, so every connected region gets one.
+        Args:
+            cells (bytes): The flat map (1 = barrier, 0 = free).
+            rows (int): The number of rows of the map.
+            cols (int): The number of columns of the map.
+            k (int): The number of landmarks.
+        Returns:
+            LandmarkTable: The landmark tables of the map.
+        """
+        digest = fingerprint(cells)
+        first_free = bytes(cells).find(b'\x00')
+        if first_free < 0 or k <= 0:
+            return cls(rows, cols, k, [], [], digest)
+
+        # seed with the cell farthest from an arbitrary free cell, i.e. one near the edge of the map
+        seed = bfs_distances(cells, rows, cols, first_free)
+        candidate = max(range(len(seed)), key=seed.__getitem__)
+        n = rows * cols
+        nearest = [INF if not cells[i] else -1 for i in range(n)]
+        landmarks, tables = [], []
+        for _ in range(k):
+            dist = bfs_distances(cells, rows, cols, candidate)
+            landmarks.append(candidate)
+            tables.append(dist)
+            for i, d in enumerate(dist):
+                if 0 <= d < nearest[i]:
+                    nearest[i] = d
+            candidate = max(range(n), key=nearest.__getitem__)
+            if nearest[candidate] <= 0:
+                break  # every free cell already is a landmark
+        return cls(rows, cols, k, landmarks, tables, digest)
+
+    def search_heuristic(self) -> Callable[[tuple[int, int], tuple[int, int]], float]:
+        """
+        Gets the heuristic for a new search; call it once per search, as the landmarks each goal
+        consults are chosen for the first cell the search asks about with that goal (its start).
+        Returns:
+            callable: The heuristic to pass to astar, ida, greedy_best_first, sma_star or ara_star.
+        """
+        self._active = {}
+        return self.heuristic
+
+    def heuristic(self, p1: tuple[int, int], p2: tuple[int, int]) -> float:
+        """
+        Heuristic function for A*, IDA* and greedy best-first: the ALT lower bound, never
+        weaker than the Manhattan distance. Infinite when p1 and p2 are not connected.
+        Get it through search_heuristic, so that every search picks its own landmarks.
+        Args:
+            p1 (tuple[int, int]): The first point (row, col).
+            p2 (tuple[int, int]): The second point (row, col), normally the end spot.
+        Returns:
+            float: A lower bound on the distance between p1 and p2.
+        """
+        cols = self.cols
+        a = p1[0] * cols + p1[1]
+        b = p2[0] * cols + p2[1]
+        active = self._active.get(b)
+        if active is None:
+            # a search asks about the same goals over and over, starting with its start spot:
+            # keep the landmarks that bound that first pair best (any lower bound stays admissible)
+            # until the next search_heuristic
+            scored = []
+            for table in self.tables:
+                da, db = table[a], table[b]
+                if (da < 0) != (db < 0):
+                    score = INF
+                else:
+                    score = abs(da - db) if da >= 0 else -1
+                scored.append((score, table, db))
+            scored.sort(key=lambda t: t[0], reverse=True)
+            active = [(table, db) for _, table, db in scored[:self.ACTIVE]]
+            self._active[b] = active
+        best = abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
+        for table, db in active:
+            da = table[a]
+            if da < 0 or db < 0:
+                if da != db:
+                    return INF  # the landmark reaches one of them but not the other
+                continue
+            d = da - db if da > db else db - da
+            if d > best:
+                best = d
+        return best
+
+    def save(self, path: str) -> None:
+        """
+        Write the tables to a file: a JSON header line followed by the raw tables.
+        """
+        header = {
+            'version': FORMAT_VERSION,
+            'rows': self.rows,
+            'cols': self.cols,
+            'fingerprint': self.fingerprint,
+            'k': self.k,
+            'landmarks': self.landmarks,
+            'itemsize': array('i').itemsize,
+        }
+        tmp = path + '.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(json.dumps(header).encode() + b'\n')
+                for table in self.tables:
+                    table.tofile(f)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.isfile(tmp):
+                os.remove(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "LandmarkTable":
+        """
+        Read tables written by save.
+        """
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+            if (not isinstance(header, dict) or header.get('version') != FORMAT_VERSION
+                    or header.get('itemsize') != array('i').itemsize):
+                raise ValueError(f"{path}: unsupported landmark table format")
+            n = header['rows'] * header['cols']
+            tables = []
+            for _ in header['landmarks']:
+                table = array('i')
+                table.fromfile(f, n)
+                tables.append(table)
+        return cls(header['rows'], header['cols'], header['k'], header['landmarks'], tables, header['fingerprint'])
+
+    @classmethod
+    def for_map(cls, cells: bytes, rows: int, cols: int, k: int = 8, path: Optional[str] = None,
+                cached: Optional["LandmarkTable"] = None) -> "LandmarkTable":
+        """
+        Gets the landmark tables of a map, computing them only if no up-to-date copy exists.
+        Args:
+            cells (bytes): The flat map (1 = barrier, 0 = free).
+            rows (int): The number of rows of the map.
+            cols (int): The number of columns of the map.
+            k (int): The number of landmarks.
+            path (str | None): Where the tables are persisted; read if it matches the map, (re)written otherwise
+                (if it cannot be written, the tables are just not persisted).
+            cached (LandmarkTable | None): A table already in memory, reused if it matches the map.
+        Returns:
+            LandmarkTable: The landmark tables of the map.
+        """
+        digest = fingerprint(cells)
+
+        def matches(table: Optional[LandmarkTable]) -> bool:
+            return (table is not None and table.fingerprint == digest
+                    and (table.rows, table.cols, table.k) == (rows, cols, k))
+
+        if matches(cached):
+            return cached
+        if path is not None and os.path.exists(path):
+            try:
+                table = cls.load(path)
+            except (OSError, ValueError, EOFError, KeyError, TypeError):
+                table = None  # unreadable or damaged: rebuild it
+            if matches(table):
+                return table
+        table = cls.build(cells, rows, cols, k)
+        if path is not None:
+            try:
+                table.save(path)
+            except OSError:
+                pass  # the file is only a cache: keep using the tables in memory
+        return table
@@ -1,6 +1,8 @@
 from utils import *
 from grid import Grid
 from searching_algorithms import *
+from map_generators import GENERATORS
+from perf_hud import PerfHUD, ProfileCapture
 
 import pygame
 
@@ -67,16 +69,34 @@ if __name__ == "__main__":
         Button(20, 245, 160, 35, "6. A*", LIGHT_BLUE, WHITE),
         Button(20, 290, 160, 35, "7. IDDFS", LIGHT_BLUE, WHITE),
         Button(20, 335, 160, 35, "8. IDA*", LIGHT_BLUE, WHITE),
+        Button(20, 380, 160, 35, "9. SMA*", LIGHT_BLUE, WHITE),
+        Button(20, 425, 160, 35, "10. ARA*", LIGHT_BLUE, WHITE),
 
     ]
+    generator_buttons = [
+        (Button(20, 470, 75, 30, "Maze", LIGHT_BLUE, WHITE), 'maze'),
+        (Button(105, 470, 75, 30, "Prim", LIGHT_BLUE, WHITE), 'prim'),
+        (Button(20, 505, 75, 30, "Noise", LIGHT_BLUE, WHITE), 'noise'),
+        (Button(105, 505, 75, 30, "Rooms", LIGHT_BLUE, WHITE), 'rooms'),
+        (Button(20, 540, 75, 30, "Caves", LIGHT_BLUE, WHITE), 'caves'),
+    ]
     start_button = Button(20, 650, 160, 40, "Start", LIGHT_BLUE, WHITE)
     reset_button = Button(20, 700, 160, 40, "Reset", LIGHT_BLUE, WHITE)
 
+    # L switches Greedy, A*, IDA*, SMA* and ARA* to the ALT landmark heuristic
+    use_alt = False
+
+    # H toggles the performance HUD, P profiles the next run
+    hud = PerfHUD(20, 580, 160, PASTEL_PINK)
+    profiler = ProfileCapture()
+    clock = pygame.time.Clock()
+
     selected_algorithm = None
     start = None
     end = None
     run = True
     started = False
+    map_seed = 0
 
     while run:
         WIN.fill(BACKGROUND)
@@ -84,12 +104,18 @@ if __name__ == "__main__":
         pygame.draw.rect(WIN, PASTEL_PINK, (0, 0, SIDEBAR_WIDTH, WIN_HEIGHT))
         for b in buttons:
             b.draw(WIN)
+        for b, _ in generator_buttons:
+            b.draw(WIN)
         start_button.draw(WIN)
         reset_button.draw(WIN)
 
         if selected_algorithm is not None:
             pygame.draw.rect(WIN, (70, 130, 180), buttons[selected_algorithm].rect, 3, border_radius=8)
 
+        clock.tick()
+        hud.tick(clock)
+        hud.draw(WIN, grid.workspace)
+
         grid.draw()
 
         for event in pygame.event.get():
@@ -108,28 +134,45 @@ if __name__ == "__main__":
                 if b.is_clicked(event):
                     selected_algorithm = i
 
+            for b, name in generator_buttons:
+                if b.is_clicked(event):
+                    # every click draws a new, reproducible map: seeds go 0, 1, 2, ...
+                    start = None
+                    end = None
+                    grid.load_barriers(GENERATORS[name](ROWS, COLS, map_seed))
+                    map_seed += 1
+
             if start_button.is_clicked(event) and not started and start and end and selected_algorithm is not None:
                 for row in grid.grid:
                     for spot in row:
                         spot.update_neighbors(grid.grid)
                 started = True
-
-                if selected_algorithm == 0:
-                    bfs(lambda: grid.draw(), grid, start, end)
-                elif selected_algorithm == 1:
-                    dfs(lambda: grid.draw(), grid, start, end)
-                elif selected_algorithm == 2:
-                    dls(lambda: grid.draw(), grid, start, end, limit=15)
-                elif selected_algorithm == 3:
-                    ucs(lambda: grid.draw(), grid, start, end)
-                elif selected_algorithm == 4:
-                    greedy_best_first(lambda: grid.draw(), grid, start, end)
-                elif selected_algorithm == 5:
-                    astar(lambda: grid.draw(), grid, start, end)
-                elif selected_algorithm == 6:
-                    iddfs(lambda: grid.draw(), grid, start, end, max_depth=20)
-                elif selected_algorithm == 7:
-                    ida(lambda: grid.draw(), grid, start, end)
+                draw = hud.wrap_draw(lambda: grid.draw(), WIN, grid.workspace)
+                heuristic = grid.landmarks().search_heuristic() if use_alt else h_manhattan_distance
+
+                with profiler.capture():
+                    hud.begin_run()
+                    if selected_algorithm == 0:
+                        bfs(draw, grid, start, end)
+                    elif selected_algorithm == 1:
+                        dfs(draw, grid, start, end)
+                    elif selected_algorithm == 2:
+                        dls(draw, grid, start, end, limit=15)
+                    elif selected_algorithm == 3:
+                        ucs(draw, grid, start, end)
+                    elif selected_algorithm == 4:
+                        greedy_best_first(draw, grid, start, end, heuristic)
+                    elif selected_algorithm == 5:
+                        astar(draw, grid, start, end, heuristic)
+                    elif selected_algorithm == 6:
+                        iddfs(draw, grid, start, end, max_depth=20)
+                    elif selected_algorithm == 7:
+                        ida(draw, grid, start, end, heuristic)
+                    elif selected_algorithm == 8:
+                        sma_star(draw, grid, start, end, max_nodes=ROWS * COLS // 4, heuristic=heuristic)
+                    elif selected_algorithm == 9:
+                        ara_star(draw, grid, start, end, heuristic, time_budget=10.0)
+                    hud.end_run()
 
                 started = False
 
@@ -141,13 +184,15 @@ if __name__ == "__main__":
                         row, col = clicked
                         spot = grid.grid[row][col]
                         if not start and spot != end:
+                            grid.clear_barrier(spot)
                             start = spot
                             start.make_start()
                         elif not end and spot != start:
+                            grid.clear_barrier(spot)
                             end = spot
                             end.make_end()
                         elif spot != end and spot != start:
-                            spot.make_barrier()
+                            grid.make_barrier(spot)
 
             elif pygame.mouse.get_pressed()[2]:
                 pos = pygame.mouse.get_pos()
@@ -156,7 +201,7 @@ if __name__ == "__main__":
                     if clicked:
                         row, col = clicked
                         spot = grid.grid[row][col]
-                        spot.reset()
+                        grid.clear_barrier(spot)
                         if spot == start:
                             start = None
                         elif spot == end:
@@ -167,6 +212,15 @@ if __name__ == "__main__":
                 end = None
                 grid.reset()
 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                hud.toggle()
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                profiler.arm()
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_l:
+                use_alt = not use_alt
+
         pygame.display.update()
 
     pygame.quit()
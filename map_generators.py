@@ -0,0 +1,340 @@
+import argparse
+import random
+import sys
+import time
+from typing import Callable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy only speeds up the cellular-automaton step
+    np = None
+
+# All generators work on a flat bytearray of length rows * cols where
+# cells[row * cols + col] == 1 means "barrier" and 0 means "free".
+WALL = 1
+FREE = 0
+
+
+def _walls(rows: int, cols: int) -> bytearray:
+    return bytearray(b'\x01') * (rows * cols)
+
+
+def recursive_backtracker(rows: int, cols: int, seed: Optional[int] = None) -> bytearray:
+    """
+    Generate a perfect maze with the (iterative) recursive-backtracker algorithm.
+    Free cells sit on odd (row, col) coordinates and the walls between them are carved away.
+    Args:
+        rows (int): The number of rows of the map.
+        cols (int): The number of columns of the map.
+        seed (int | None): Seed for the random number generator.
+    Returns:
+        bytearray: The generated map (1 = barrier, 0 = free).
+    """
+    cells = _walls(rows, cols)
+    if rows < 3 or cols < 3:
+        return cells
+    rng = random.Random(seed)
+    last_row, last_col = rows - 2, cols - 2
+    step_row = 2 * cols
+
+    start = cols + 1
+    cells[start] = FREE
+    stack = [start]
+    while stack:
+        current = stack[-1]
+        row, col = divmod(current, cols)
+        options = []
+        if row >= 3 and cells[current - step_row]:
+            options.append(-step_row)
+        if row + 2 <= last_row and cells[current + step_row]:
+            options.append(step_row)
+        if col >= 3 and cells[current - 2]:
+            options.append(-2)
+        if col + 2 <= last_col and cells[current + 2]:
+            options.append(2)
+
+        if not options:
+            stack.pop()
+            continue
+        step = options[rng.randrange(len(options))] if len(options) > 1 else options[0]
+        cells[current + step // 2] = FREE
+        cells[current + step] = FREE
+        stack.append(current + step)
+    return cells
+
+
+def prim_maze(rows: int, cols: int, seed: Optional[int] = None) -> bytearray:
+    """
+    Generate a perfect maze with the randomized Prim's algorithm.
+    Args:
+        rows (int): The number of rows of the map.
+        cols (int): The number of columns of the map.
+        seed (int | None): Seed for the random number generator.
+    Returns:
+        bytearray: The generated map (1 = barrier, 0 = free).
+    """
+    cells = _walls(rows, cols)
+    if rows < 3 or cols < 3:
+        return cells
+    rng = random.Random(seed)
+    last_row, last_col = rows - 2, cols - 2
+    step_row = 2 * cols
+
+    def add_frontier(node: int) -> None:
+        row, col = divmod(node, cols)
+        if row >= 3 and cells[node - step_row]:
+            frontier.append((node - step_row, node))
+        if row + 2 <= last_row and cells[node + step_row]:
+            frontier.append((node + step_row, node))
+        if col >= 3 and cells[node - 2]:
+            frontier.append((node - 2, node))
+        if col + 2 <= last_col and cells[node + 2]:
+            frontier.append((node + 2, node))
+
+    frontier = []
+    start = cols + 1
+    cells[start] = FREE
+    add_frontier(start)
+    while frontier:
+        # swap-remove a random frontier edge in O(1)
+        k = rng.randrange(len(frontier))
+        frontier[k], frontier[-1] = frontier[-1], frontier[k]
+        node, parent = frontier.pop()
+        if not cells[node]:
+            continue
+        cells[(node + parent) // 2] = FREE
+        cells[node] = FREE
+        add_frontier(node)
+    return cells
+
+
+def random_noise(rows: int, cols: int, seed: Optional[int] = None, density: float = 0.3) -> bytearray:
+    """
+    Generate a map where every cell is a barrier with probability `density`.
+    Args:
+        rows (int): The number of rows of the map.
+        cols (int): The number of columns of the map.
+        seed (int | None): Seed for the random number generator.
+        density (float): The fraction of cells that become barriers, in [0, 1].
+    Returns:
+        bytearray: The generated map (1 = barrier, 0 = free).
+    """
+    if not 0.0 <= density <= 1.0:
+        raise ValueError(f"density must be in [0, 1], got {density}")
+    rng = random.Random(seed)
+    # one random byte per cell, mapped to 0/1 in C through a translation table
+    threshold = round(density * 256)
+    table = bytes(WALL if b < threshold else FREE for b in range(256))
+    return bytearray(rng.randbytes(rows * cols).translate(table))
+
+
+def rooms_and_corridors(rows: int, cols: int, seed: Optional[int] = None, max_rooms: Optional[int] = None,
+                        min_size: int = 3, max_size: int = 12) -> bytearray:
+    """
+    Generate a dungeon-like map: non-overlapping rectangular rooms joined by L-shaped corridors.
+    Args:
+        rows (int): The number of rows of the map.
+        cols (int): The number of columns of the map.
+        seed (int | None): Seed for the random number generator.
+        max_rooms (int | None): How many rooms to try to place (defaults to one per ~150 cells).
+        min_size (int): The minimum side of a room.
+        max_size (int): The maximum side of a room.
+    Returns:
+        bytearray: The generated map (1 = barrier, 0 = free).
+    """
+    cells = _walls(rows, cols)
+    max_size = min(max_size, rows - 2, cols - 2)
+    if max_size < 1:
+        return cells
+    min_size = max(1, min(min_size, max_size))
+    if max_rooms is None:
+        max_rooms = max(1, rows * cols // 150)
+    rng = random.Random(seed)
+
+    rooms = []
+    for _ in range(max_rooms):
+        height = rng.randint(min_size, max_size)
+        width = rng.randint(min_size, max_size)
+        top = rng.randint(1, rows - height - 1)
+        left = rng.randint(1, cols - width - 1)
+        # reject the room if it (plus a one-cell margin) touches an already carved floor
+        if any(FREE in cells[row * cols + left - 1:row * cols + left + width + 1]
+               for row in range(top - 1, top + height + 1)):
+            continue
+        rooms.append((top, left, top + height, left + width))
+        floor = bytes(width)
+        for row in range(top, top + height):
+            base = row * cols + left
+            cells[base:base + width] = floor
+
+    # chain the rooms in serpentine order over horizontal bands so corridors stay short
+    band = 2 * max_size
+    centers = sorted((((top + bottom) // 2, (left + right) // 2) for top, left, bottom, right in rooms),
+                     key=lambda rc: (rc[0] // band, rc[1] if (rc[0] // band) % 2 == 0 else -rc[1]))
+    for (r1, c1), (r2, c2) in zip(centers, centers[1:]):
+        if rng.random() < 0.5:
+            _carve_row(cells, cols, r1, c1, c2)
+            _carve_col(cells, cols, c2, r1, r2)
+        else:
+            _carve_col(cells, cols, c1, r1, r2)
+            _carve_row(cells, cols, r2, c1, c2)
+    return cells
+
+
+def _carve_row(cells: bytearray, cols: int, row: int, c1: int, c2: int) -> None:
+    lo, hi = min(c1, c2), max(c1, c2)
+    cells[row * cols + lo:row * cols + hi + 1] = bytes(hi - lo + 1)
+
+
+def _carve_col(cells: bytearray, cols: int, col: int, r1: int, r2: int) -> None:
+    lo, hi = min(r1, r2), max(r1, r2)
+    cells[lo * cols + col:hi * cols + col + 1:cols] = bytes(hi - lo + 1)
+
+
+def cellular_caves(rows: int, cols: int, seed: Optional[int] = None, density: float = 0.45,
+                   iterations: int = 4) -> bytearray:
+    """
+    Generate organic caves: start from random noise and smooth it with a cellular automaton.
+    A cell becomes a barrier when more than 4 of its 8 neighbours are barriers, becomes free
+    when fewer than 4 are, and keeps its state otherwise. Cells outside the map count as barriers.
+    Uses numpy when it is installed; the pure-Python fallback produces the exact same map.
+    Args:
+        rows (int): The number of rows of the map.
+        cols (int): The number of columns of the map.
+        seed (int | None): Seed for the random number generator.
+        density (float): The initial fraction of barriers.
+        iterations (int): How many smoothing steps to run.
+    Returns:
+        bytearray: The generated map (1 = barrier, 0 = free).
+    """
+    cells = random_noise(rows, cols, seed, density)
+    if iterations <= 0 or rows == 0 or cols == 0:
+        return cells
+    if np is not None:
+        return _caves_numpy(cells, rows, cols, iterations)
+    return _caves_python(cells, rows, cols, iterations)
+
+
+def _caves_numpy(cells: bytearray, rows: int, cols: int, iterations: int) -> bytearray:
+    state = np.frombuffer(bytes(cells), dtype=np.uint8).reshape(rows, cols)
+    padded = np.ones((rows + 2, cols + 2), dtype=np.uint8)
+    for _ in range(iterations):
+        padded[1:-1, 1:-1] = state
+        count = np.zeros((rows, cols), dtype=np.uint8)
+        for dr in (0, 1, 2):
+            for dc in (0, 1, 2):
+                if dr != 1 or dc != 1:
+                    count += padded[dr:dr + rows, dc:dc + cols]
+        state = np.where(count > 4, 1, np.where(count < 4, 0, state)).astype(np.uint8)
+    return bytearray(state.tobytes())
+
+
+def _caves_python(cells: bytearray, rows: int, cols: int, iterations: int) -> bytearray:
+    state = [[1] + list(cells[r * cols:(r + 1) * cols]) + [1] for r in range(rows)]
+    border = [1] * (cols + 2)
+    for _ in range(iterations):
+        padded = [border] + state + [border]
+        new_state = []
+        for r in range(1, rows + 1):
+            above, row, below = padded[r - 1], padded[r], padded[r + 1]
+            # vertical sums of each column triple, then a sliding window of three
+            col_sum = [a + b + c for a, b, c in zip(above, row, below)]
+            new_row = [1]
+            for c in range(1, cols + 1):
+                count = col_sum[c - 1] + col_sum[c] + col_sum[c + 1] - row[c]
+                new_row.append(1 if count > 4 else 0 if count < 4 else row[c])
+            new_row.append(1)
+            new_state.append(new_row)
+        state = new_state
+    out = bytearray()
+    for row in state:
+        out += bytes(row[1:-1])
+    return out
+
+
+GENERATORS: dict[str, Callable[..., bytearray]] = {
+    'maze': recursive_backtracker,
+    'prim': prim_maze,
+    'noise': random_noise,
+    'rooms': rooms_and_corridors,
+    'caves': cellular_caves,
+}
+
+
+def write_map(path: str, rows: int, cols: int, cells: bytes) -> None:
+    """
+    Write a map as text: one line per row, '#' for a barrier and '.' for a free cell.
+    Args:
+        path (str): The output file path.
+        rows (int): The number of rows of the map.
+        cols (int): The number of columns of the map.
+        cells (bytes): The flat map (1 = barrier, 0 = free).
+    Returns:
+        None
+    """
+    table = bytes.maketrans(b'\x00\x01', b'.#')
+    with open(path, 'wb') as f:
+        for row in range(rows):
+            f.write(bytes(cells[row * cols:(row + 1) * cols]).translate(table))
+            f.write(b'\n')
+
+
+def read_map(path: str) -> tuple[int, int, bytearray]:
+    """
+    Read a map written by write_map.
+    Args:
+        path (str): The map file path.
+    Returns:
+        tuple[int, int, bytearray]: The number of rows, the number of columns and the flat map.
+    """
+    table = bytes.maketrans(b'.#', b'\x00\x01')
+    cells = bytearray()
+    rows = 0
+    cols = None
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.rstrip(b'\r\n')
+            if not line:
+                continue
+            if cols is None:
+                cols = len(line)
+            elif len(line) != cols:
+                raise ValueError(f"{path}: row {rows} has {len(line)} cells, expected {cols}")
+            cells += line.translate(table)
+            rows += 1
+    if cols is None:
+        raise ValueError(f"{path}: empty map")
+    if cells.strip(b'\x00\x01'):
+        raise ValueError(f"{path}: unexpected characters, only '#' and '.' are allowed")
+    return rows, cols, cells
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a map and write it as a '#'/'.' text file.")
+    parser.add_argument('generator', choices=sorted(GENERATORS))
+    parser.add_argument('--rows', type=int, default=50)
+    parser.add_argument('--cols', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--density', type=float, default=None,
+                        help="barrier density for 'noise' and 'caves'")
+    parser.add_argument('-o', '--output', required=True, help="output map file")
+    args = parser.parse_args(argv)
+
+    kwargs = {}
+    if args.density is not None:
+        if args.generator not in ('noise', 'caves'):
+            parser.error("--density only applies to 'noise' and 'caves'")
+        kwargs['density'] = args.density
+
+    t0 = time.perf_counter()
+    cells = GENERATORS[args.generator](args.rows, args.cols, args.seed, **kwargs)
+    t1 = time.perf_counter()
+    write_map(args.output, args.rows, args.cols, cells)
+    t2 = time.perf_counter()
+    print(f"{args.generator}: {args.rows}x{args.cols} generated in {t1 - t0:.2f}s, "
+          f"written in {t2 - t1:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
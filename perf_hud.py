@@ -0,0 +1,157 @@
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import pygame
+
+from search_workspace import SearchWorkspace
+
+
+class PerfHUD:
+    """
+    A few lines of live performance numbers drawn in the sidebar: FPS of the main loop,
+    expansions per second and frontier size of the current search, and how the time of the
+    last run was split between searching and drawing.
+    """
+
+    def __init__(self, x: int, y: int, width: int, background: tuple, color: tuple = (0, 0, 0)):
+        """
+        Args:
+            x (int): The left edge of the HUD in the window.
+            y (int): The top edge of the HUD in the window.
+            width (int): The width of the HUD.
+            background (tuple): The color the HUD area is cleared with before every redraw.
+            color (tuple): The text color.
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.background = background
+        self.color = color
+        self.enabled = False
+        self.font = pygame.font.SysFont("times new roman", 14)
+        self.fps = 0.0
+        self.run_start: Optional[float] = None
+        self.run_time = 0.0
+        self.draw_time = 0.0
+        self.frames = 0
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+
+    def tick(self, clock: pygame.time.Clock) -> None:
+        """
+        Record the frame rate of the main loop; call once per frame after clock.tick().
+        """
+        self.fps = clock.get_fps()
+
+    def begin_run(self) -> None:
+        self.run_start = time.perf_counter()
+        self.run_time = 0.0
+        self.draw_time = 0.0
+        self.frames = 0
+
+    def end_run(self) -> None:
+        if self.run_start is not None:
+            self.run_time = time.perf_counter() - self.run_start
+            self.run_start = None
+
+    def wrap_draw(self, draw: Callable[[], None], win, workspace: SearchWorkspace) -> Callable[[], None]:
+        """
+        Wrap the draw callback handed to a search so that its cost is measured and the HUD
+        is refreshed with the search.
+        Args:
+            draw (callable): The draw callback of the search.
+            win: The Pygame window.
+            workspace (SearchWorkspace): The workspace the search reports its statistics to.
+        Returns:
+            callable: The timed draw callback.
+        """
+        def timed_draw() -> None:
+            t0 = time.perf_counter()
+            if self.enabled:
+                self.draw(win, workspace)
+            draw()
+            self.frames += 1
+            self.draw_time += time.perf_counter() - t0
+        return timed_draw
+
+    def lines(self, workspace: SearchWorkspace) -> list[str]:
+        fps = self.fps
+        if self.run_start is not None:
+            # the main loop is blocked while a search runs: its frames are the draw callbacks
+            total = time.perf_counter() - self.run_start
+            fps = self.frames / total if total > 0 else 0.0
+        else:
+            total = self.run_time
+        search_time = max(total - self.draw_time, 0.0)
+        rate = workspace.expanded / search_time if search_time > 0 else 0.0
+        share = 100.0 * search_time / total if total > 0 else 0.0
+        return [
+            f"FPS: {fps:.0f}",
+            f"Expanded/s: {rate:,.0f}",
+            f"Frontier: {workspace.frontier:,}",
+            f"Search {share:.1f}% / draw {100.0 - share:.1f}%" if total > 0 else "Search - / draw -",
+        ]
+
+    def draw(self, win, workspace: SearchWorkspace) -> None:
+        """
+        Draw the HUD (if enabled) onto the window.
+        """
+        if not self.enabled:
+            return
+        line_height = self.font.get_linesize()
+        lines = self.lines(workspace)
+        pygame.draw.rect(win, self.background, (self.x, self.y, self.width, line_height * len(lines)))
+        for k, line in enumerate(lines):
+            win.blit(self.font.render(line, True, self.color), (self.x, self.y + k * line_height))
+
+
+class ProfileCapture:
+    """
+    Records a cProfile and tracemalloc capture of the next search run once armed.
+    The results are written to <prefix>-<timestamp>.prof (open with pstats or snakeviz)
+    and <prefix>-<timestamp>-memory.txt.
+    """
+
+    def __init__(self, prefix: str = "profile", top: int = 25):
+        """
+        Args:
+            prefix (str): The path prefix of the output files.
+            top (int): How many allocation sites to list in the memory report.
+        """
+        self.prefix = prefix
+        self.top = top
+        self.armed = False
+
+    def arm(self) -> None:
+        self.armed = True
+
+    @contextmanager
+    def capture(self) -> Iterator[None]:
+        """
+        Profile the body of the with-block if the capture is armed, then disarm it.
+        """
+        if not self.armed:
+            yield
+            return
+        self.armed = False
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        profiler = cProfile.Profile()
+        tracemalloc.start()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            profiler.dump_stats(f"{self.prefix}-{stamp}.prof")
+            with open(f"{self.prefix}-{stamp}-memory.txt", "w") as f:
+                f.write(f"current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB\n\n")
+                for stat in snapshot.statistics('lineno')[:self.top]:
+                    f.write(f"{stat}\n")
+            print(f"Profile written to {self.prefix}-{stamp}.prof and {self.prefix}-{stamp}-memory.txt")
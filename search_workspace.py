@@ -0,0 +1,90 @@
+INF = float('inf')
+
+
+class SearchWorkspace:
+    """
+    Scratch memory shared by every search run on one grid.
+
+    All arrays are flat and indexed by row * cols + col. Instead of clearing them before
+    each query, every query gets a fresh generation number: an entry only counts as set
+    if its stamp equals the stamp of the current query, so starting a search is O(1).
+    """
+
+    def __init__(self, rows: int, cols: int):
+        """
+        Allocate the workspace for a grid.
+        Args:
+            rows (int): The number of rows of the grid.
+            cols (int): The number of columns of the grid.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.size: int = rows * cols
+        self.generation: int = 0
+        self.query: int = 0  # the stamp of the current query (seen[i] == query <=> g[i], parent[i] are valid)
+        self.seen: list[int] = [0] * self.size
+        # closed[i] == query  <=>  cell i has been expanded in this query
+        self.closed: list[int] = [0] * self.size
+        self.g: list[float] = [INF] * self.size
+        self.parent: list[int] = [-1] * self.size
+        # statistics of the last query
+        self.expanded: int = 0
+        self.frontier: int = 0
+        self.path: list[int] = []
+        self.bound: float | None = None  # proven suboptimality bound of path, for anytime searches
+
+    def begin(self) -> int:
+        """
+        Start a new query: invalidates everything recorded by the previous one.
+        Returns:
+            int: The generation stamp of the new query.
+        """
+        self.generation += 1
+        self.query = self.generation
+        self.expanded = 0
+        self.frontier = 0
+        self.path = []
+        self.bound = None
+        return self.query
+
+    def fresh_stamp(self) -> int:
+        """
+        Gets a stamp no array holds yet, without starting a new query: e.g. to empty the
+        closed set between the iterations of an anytime search while keeping g and parent.
+        Returns:
+            int: The new stamp.
+        """
+        self.generation += 1
+        return self.generation
+
+    def index(self, row: int, col: int) -> int:
+        """
+        Gets the flat index of a cell.
+        Returns:
+            int: row * cols + col
+        """
+        return row * self.cols + col
+
+    def g_of(self, i: int) -> float:
+        """
+        Gets the cost recorded for cell i in the current query.
+        Returns:
+            float: The recorded cost, or infinity if the cell has not been reached.
+        """
+        return self.g[i] if self.seen[i] == self.query else INF
+
+    def trace(self, i: int) -> list[int]:
+        """
+        Follow the parent links of the current query back from cell i.
+        Args:
+            i (int): The flat index of the last cell of the path.
+        Returns:
+            list[int]: The flat indices of the path, from the first cell to i.
+        """
+        path = [i]
+        parent = self.parent
+        while parent[i] != -1:
+            i = parent[i]
+            path.append(i)
+        path.reverse()
+        return path
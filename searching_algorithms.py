@@ -1,12 +1,39 @@
 from utils import *
+import time
 from collections import deque
-from queue import PriorityQueue
+from heapq import heapify, heappush, heappop
 from grid import Grid
 from spot import Spot
-from typing import Callable, Optional, Tuple
+from typing import Callable, Iterable, Optional, Tuple
 
-pygame.mixer.init()
-path_found_sound = pygame.mixer.Sound("path_found.wav")
+try:
+    pygame.mixer.init()
+    path_found_sound = pygame.mixer.Sound("path_found.wav")
+except (pygame.error, FileNotFoundError):
+    path_found_sound = None  # no audio device or sound file, e.g. when solving in batch
+
+def poll_events() -> list:
+    """
+    Gets the pending Pygame events, or none at all when there is no window (batch solving).
+    """
+    if not pygame.display.get_init():
+        return []
+    return pygame.event.get()
+
+def play_path_found() -> None:
+    if path_found_sound is not None:
+        pygame.mixer.Sound.play(path_found_sound)
+
+def unreachable(grid: Grid, start: Spot, end: Spot) -> bool:
+    """
+    Checks the grid's connected components, in O(1), before a search is started.
+    Returns:
+        bool: True if there is no path from start to end, so the search can fail right away.
+    """
+    if grid.connected(start, end):
+        return False
+    grid.workspace.begin()  # report an empty search
+    return True
 
 def bfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
     """
@@ -21,34 +48,37 @@ def bfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
     """
     if start == None or end == None:
         return False
+    if unreachable(grid, start, end):
+        return False
+    ws = grid.workspace
+    gen = ws.begin()
+    seen, parent = ws.seen, ws.parent
+    seen[start.index] = gen
+    parent[start.index] = -1
     queue = deque()
     queue.append(start)
-    visited = {start}
-    came_from = {}
 
     while queue:
-        for event in pygame.event.get():
+        for event in poll_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return False
 
         current = queue.popleft()
+        ws.expanded += 1
         if current == end:
-            while current in came_from:
-                current = came_from[current]
-                current.make_path()
-                draw()
-            end.make_end()
-            start.make_start()
-            pygame.mixer.Sound.play(path_found_sound)
+            draw_path(grid, end, start, end, draw)
+            play_path_found()
             return True
 
         for neighbor in current.neighbors:
-            if neighbor not in visited and not neighbor.is_barrier():
-                visited.add(neighbor)
-                came_from[neighbor] = current
+            ni = neighbor.index
+            if seen[ni] != gen and not neighbor.is_barrier():
+                seen[ni] = gen
+                parent[ni] = current.index
                 queue.append(neighbor)
                 neighbor.make_open()
+        ws.frontier = len(queue)
 
         draw()
         if current != start:
@@ -69,34 +99,37 @@ def dfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
     """
     if start == None or end == None:
         return False
+    if unreachable(grid, start, end):
+        return False
 
+    ws = grid.workspace
+    gen = ws.begin()
+    seen, parent = ws.seen, ws.parent
+    seen[start.index] = gen
+    parent[start.index] = -1
     stack = [start]
-    visited = {start}
-    came_from = {}
 
     while stack:
-        for event in pygame.event.get():
+        for event in poll_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
 
         current = stack.pop()
+        ws.expanded += 1
 
         if current == end:
-            while current in came_from:
-                current = came_from[current]
-                current.make_path()
-                draw()
-            end.make_end()
-            start.make_start()
-            pygame.mixer.Sound.play(path_found_sound)
+            draw_path(grid, end, start, end, draw)
+            play_path_found()
             return True
 
         for neighbor in current.neighbors:
-            if neighbor not in visited and not neighbor.is_barrier():
-                visited.add(neighbor)
-                came_from[neighbor] = current
+            ni = neighbor.index
+            if seen[ni] != gen and not neighbor.is_barrier():
+                seen[ni] = gen
+                parent[ni] = current.index
                 stack.append(neighbor)
                 neighbor.make_open()
+        ws.frontier = len(stack)
 
         draw()
 
@@ -132,7 +165,8 @@ def h_euclidian_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
     return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
 
 
-def astar(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+def astar(draw: callable, grid: Grid, start: Spot, end: Spot,
+          heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float] = h_manhattan_distance) -> bool:
     """
     A* Pathfinding Algorithm.
     Args:
@@ -140,65 +174,55 @@ def astar(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
         grid (Grid): The Grid object containing the spots.
         start (Spot): The starting spot.
         end (Spot): The ending spot.
+        heuristic (callable): An admissible estimate of the distance between two positions.
     Returns:
         bool: True if a path is found, False otherwise.
     """
-    count = 0
-    open_heap = PriorityQueue()
-
-    def h(p1: tuple[int, int], p2: tuple[int, int]) -> float:
-        """
-        Heuristic function for A* algorithm: uses the Manhattan distance between two points.
-        Args:
-            p1 (tuple[int, int]): The first point (x1, y1).
-            p2 (tuple[int, int]): The second point (x2, y2).
-        Returns:
-            float: The Manhattan distance between p1 and p2.
-        """
-        x1, y1 = p1
-        x2, y2 = p2
-        return abs(x1 - x2) + abs(y1 - y2)
-
-    open_heap.put((0, count, start))
-    came_from = {}
+    if start is None or end is None:
+        return False
+    if unreachable(grid, start, end):
+        return False
 
-    g_score = {spot: float('inf') for row in grid.grid for spot in row}
-    f_score = {spot: float('inf') for row in grid.grid for spot in row}
+    count = 0
+    open_heap = []
+    h = heuristic
 
-    g_score[start] = 0
-    f_score[start] = h(start.get_position(), end.get_position())
+    ws = grid.workspace
+    gen = ws.begin()
+    seen, closed, g_score, parent = ws.seen, ws.closed, ws.g, ws.parent
+    spots = grid.spots
+    end_pos = end.get_position()
 
-    lookup_set = {start}
+    seen[start.index] = gen
+    g_score[start.index] = 0
+    parent[start.index] = -1
+    heappush(open_heap, (h(start.get_position(), end_pos), count, start.index))
 
-    while not open_heap.empty():
-        current = open_heap.get()[2]
-        lookup_set.remove(current)
+    while open_heap:
+        i = heappop(open_heap)[2]
+        if closed[i] == gen:
+            continue  # stale entry, the cell was already expanded with a better f
+        closed[i] = gen
+        ws.expanded += 1
+        current = spots[i]
 
         if current == end:
-            while current in came_from:
-                current = came_from[current]
-                if current != start:
-                    current.make_path()
-                draw()
-            end.make_end()
-            start.make_start()
-            pygame.mixer.Sound.play(path_found_sound)
+            draw_path(grid, end, start, end, draw)
+            play_path_found()
             return True
 
+        tentative_g = g_score[i] + 1
         for neighbor in current.neighbors:
-            tentative_g = g_score[current] + 1
-
-            if tentative_g < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + h(neighbor.get_position(), end.get_position())
-
-                if neighbor not in lookup_set:
-                    count += 1
-                    open_heap.put((f_score[neighbor], count, neighbor))
-                    lookup_set.add(neighbor)
-                    if neighbor != end:
-                        neighbor.make_open()
+            ni = neighbor.index
+            if seen[ni] != gen or tentative_g < g_score[ni]:
+                seen[ni] = gen
+                parent[ni] = i
+                g_score[ni] = tentative_g
+                count += 1
+                heappush(open_heap, (tentative_g + h(neighbor.get_position(), end_pos), count, ni))
+                if neighbor != end:
+                    neighbor.make_open()
+        ws.frontier = len(open_heap)
 
         draw()
 
@@ -207,14 +231,34 @@ def astar(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
 
     return False
 
-def reconstruct_path(came_from: dict, current: Spot, start: Spot, end: Spot, draw: Callable[[], None]) -> None:
+def reconstruct_path(came_from: dict, current: Spot, start: Spot, end: Spot, draw: Callable[[], None]) -> list[Spot]:
+    path = [current]
     while current in came_from:
         current = came_from[current]
+        path.append(current)
         if current != start:
             current.make_path()
         draw()
     end.make_end()
     start.make_start()
+    path.reverse()
+    return path
+
+def draw_path(grid: Grid, current: Spot, start: Spot, end: Spot, draw: Callable[[], None]) -> None:
+    """
+    Same as reconstruct_path, but follows the parent links of the grid's search workspace.
+    The path is also left in grid.workspace.path as flat indices, from start to current.
+    """
+    ws = grid.workspace
+    ws.path = ws.trace(current.index)
+    spots = grid.spots
+    for i in reversed(ws.path[:-1]):
+        spot = spots[i]
+        if spot != start:
+            spot.make_path()
+        draw()
+    end.make_end()
+    start.make_start()
 
 def dls(draw: callable, grid: Grid, start: Spot, end: Spot, limit: int) -> bool:
     """
@@ -223,12 +267,17 @@ def dls(draw: callable, grid: Grid, start: Spot, end: Spot, limit: int) -> bool:
     """
     if start is None or end is None:
         return False
+    if unreachable(grid, start, end):
+        return False
+    ws = grid.workspace
+    ws.begin()
 
     def dfs_limit(node: Spot, depth: int, visited_path: set) -> bool:
-        for event in pygame.event.get():
+        for event in poll_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return False
+        ws.expanded += 1
 
         if node == end:
             return True
@@ -240,11 +289,13 @@ def dls(draw: callable, grid: Grid, start: Spot, end: Spot, limit: int) -> bool:
             if neighbor in visited_path or neighbor.is_barrier():
                 continue
             visited_path.add(neighbor)
+            stack.append(neighbor)
             neighbor.make_open()
             draw()
             found = dfs_limit(neighbor, depth - 1, visited_path)
             if found:
                 return True
+            stack.pop()
             visited_path.remove(neighbor)
             if neighbor != end:
                 neighbor.make_closed()
@@ -252,27 +303,14 @@ def dls(draw: callable, grid: Grid, start: Spot, end: Spot, limit: int) -> bool:
         return False
 
     visited_path = {start}
+    stack = [start]  # the spots from start to the node being searched
     start.make_open()
     found = dfs_limit(start, limit, visited_path)
     if found:
-        came_from = {}
-
-        def dfs_parent(node: Spot, target: Spot, visited_p: set) -> bool:
-            if node == target:
-                return True
-            for neighbor in node.neighbors:
-                if neighbor in visited_p or neighbor.is_barrier():
-                    continue
-                visited_p.add(neighbor)
-                came_from[neighbor] = node
-                if dfs_parent(neighbor, target, visited_p):
-                    return True
-            return False
-
-        visited_p = {start}
-        dfs_parent(start, end, visited_p)
-        reconstruct_path(came_from, end, start, end, draw)
-        pygame.mixer.Sound.play(path_found_sound)
+        # the stack that reached end is the path, so it never exceeds the limit
+        came_from = {child: parent for parent, child in zip(stack, stack[1:])}
+        grid.workspace.path = [spot.index for spot in reconstruct_path(came_from, end, start, end, draw)]
+        play_path_found()
         return True
 
     return False
@@ -280,43 +318,55 @@ def dls(draw: callable, grid: Grid, start: Spot, end: Spot, limit: int) -> bool:
 def ucs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
     if start is None or end is None:
         return False
+    if unreachable(grid, start, end):
+        return False
 
     count = 0
-    pq = PriorityQueue()
-    pq.put((0, count, start))
-    came_from = {}
-    g_score = {spot: float('inf') for row in grid.grid for spot in row}
-    g_score[start] = 0
-    visited = set()
-
-    while not pq.empty():
-        for event in pygame.event.get():
+    pq = []
+    ws = grid.workspace
+    gen = ws.begin()
+    seen, closed, g_score, parent = ws.seen, ws.closed, ws.g, ws.parent
+    spots = grid.spots
+
+    seen[start.index] = gen
+    g_score[start.index] = 0
+    parent[start.index] = -1
+    heappush(pq, (0, count, start.index))
+
+    while pq:
+        for event in poll_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return False
 
-        current = pq.get()[2]
+        i = heappop(pq)[2]
+        current = spots[i]
 
         if current == end:
-            reconstruct_path(came_from, end, start, end, draw)
-            pygame.mixer.Sound.play(path_found_sound)
+            ws.expanded += 1
+            draw_path(grid, end, start, end, draw)
+            play_path_found()
             return True
 
-        if current in visited:
+        if closed[i] == gen:
             continue
-        visited.add(current)
+        closed[i] = gen
+        ws.expanded += 1
 
+        tentative_g = g_score[i] + 1
         for neighbor in current.neighbors:
             if neighbor.is_barrier():
                 continue
-            tentative_g = g_score[current] + 1
-            if tentative_g < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g
+            ni = neighbor.index
+            if seen[ni] != gen or tentative_g < g_score[ni]:
+                seen[ni] = gen
+                parent[ni] = i
+                g_score[ni] = tentative_g
                 count += 1
-                pq.put((g_score[neighbor], count, neighbor))
+                heappush(pq, (tentative_g, count, ni))
                 if neighbor != end:
                     neighbor.make_open()
+        ws.frontier = len(pq)
 
         draw()
         if current != start:
@@ -328,35 +378,47 @@ def greedy_best_first(draw: callable, grid: Grid, start: Spot, end: Spot,
                       heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float] = h_manhattan_distance) -> bool:
     if start is None or end is None:
         return False
+    if unreachable(grid, start, end):
+        return False
 
     count = 0
-    pq = PriorityQueue()
-    pq.put((heuristic(start.get_position(), end.get_position()), count, start))
-    came_from = {}
-    visited = set([start])
+    pq = []
+    ws = grid.workspace
+    gen = ws.begin()
+    seen, parent = ws.seen, ws.parent
+    spots = grid.spots
+    end_pos = end.get_position()
 
-    while not pq.empty():
-        for event in pygame.event.get():
+    seen[start.index] = gen
+    parent[start.index] = -1
+    heappush(pq, (heuristic(start.get_position(), end_pos), count, start.index))
+
+    while pq:
+        for event in poll_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return False
 
-        current = pq.get()[2]
+        i = heappop(pq)[2]
+        current = spots[i]
+        ws.expanded += 1
 
         if current == end:
-            reconstruct_path(came_from, end, start, end, draw)
-            pygame.mixer.Sound.play(path_found_sound)
+            draw_path(grid, end, start, end, draw)
+            play_path_found()
             return True
 
         for neighbor in current.neighbors:
-            if neighbor in visited or neighbor.is_barrier():
+            ni = neighbor.index
+            if seen[ni] == gen or neighbor.is_barrier():
                 continue
-            visited.add(neighbor)
-            came_from[neighbor] = current
+            seen[ni] = gen
+            parent[ni] = i
             count += 1
-            pq.put((heuristic(neighbor.get_position(), end.get_position()), count, neighbor))
+            heappush(pq, (heuristic(neighbor.get_position(), end_pos), count, ni))
             if neighbor != end:
                 neighbor.make_open()
+        ws.frontier = len(pq)
 
         draw()
         if current != start:
@@ -367,16 +429,23 @@ def greedy_best_first(draw: callable, grid: Grid, start: Spot, end: Spot,
 def iddfs(draw: callable, grid: Grid, start: Spot, end: Spot, max_depth: Optional[int] = None) -> bool:
     if start is None or end is None:
         return False
+    if unreachable(grid, start, end):
+        return False
 
     if max_depth is None:
         rows = len(grid.grid)
         cols = len(grid.grid[0]) if rows > 0 else 0
         max_depth = rows * cols
 
+    ws = grid.workspace
+    expanded = 0
     for depth in range(max_depth + 1):
         found = dls(draw, grid, start, end, depth)
+        # every dls starts a new query: report the work of all the iterations together
+        expanded += ws.expanded
+        ws.expanded = expanded
         if found:
-            pygame.mixer.Sound.play(path_found_sound)
+            play_path_found()
             return True
     return False
 
@@ -384,12 +453,17 @@ def ida(draw: callable, grid: Grid, start: Spot, end: Spot,
         heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float] = h_manhattan_distance) -> bool:
     if start is None or end is None:
         return False
+    if unreachable(grid, start, end):
+        return False
 
     start_pos = start.get_position()
     end_pos = end.get_position()
     bound = heuristic(start_pos, end_pos)
+    ws = grid.workspace
+    ws.begin()
 
     def search(node: Spot, g: float, bound: float, path_set: set, came_from: dict) -> (bool, float):
+        ws.expanded += 1
 
         f = g + heuristic(node.get_position(), end_pos)
         if f > bound:
@@ -423,9 +497,554 @@ def ida(draw: callable, grid: Grid, start: Spot, end: Spot,
         path_set = {start}
         found, next_bound = search(start, 0, bound, path_set, came_from)
         if found:
-            reconstruct_path(came_from, end, start, end, draw)
-            pygame.mixer.Sound.play(path_found_sound)
+            grid.workspace.path = [spot.index for spot in reconstruct_path(came_from, end, start, end, draw)]
+            play_path_found()
             return True
         if next_bound == float('inf'):
             return False
         bound = next_bound
+
+def _seed_sources(grid: Grid, starts: Iterable[Spot], ends: Iterable[Spot]) -> tuple[list[Spot], list[Spot], int]:
+    """
+    Start a new workspace query with every start spot as a source (g = 0, no parent).
+    Returns:
+        tuple[list[Spot], list[Spot], int]: The distinct start spots, the distinct end spots
+        that share a connected component with some start, and the generation stamp of the query.
+    """
+    starts = list(dict.fromkeys(s for s in starts if s is not None))
+    ends = list(dict.fromkeys(e for e in ends if e is not None))
+    # goals in a component without any start can never be reached: leave them out
+    components = grid.components
+    reachable = {components.component(s.index) for s in starts} - {-1}
+    ends = [e for e in ends if components.component(e.index) in reachable]
+    ws = grid.workspace
+    gen = ws.begin()
+    for s in starts:
+        ws.seen[s.index] = gen
+        ws.g[s.index] = 0
+        ws.parent[s.index] = -1
+    return starts, ends, gen
+
+def _draw_multi_path(grid: Grid, goal: Spot, starts: list[Spot], ends: list[Spot], draw: Callable[[], None]) -> None:
+    """
+    Draw the path from whichever start it came from to goal, and leave it in grid.workspace.path.
+    """
+    ws = grid.workspace
+    ws.path = ws.trace(goal.index)
+    spots = grid.spots
+    for i in reversed(ws.path[1:-1]):
+        spots[i].make_path()
+        draw()
+    for e in ends:
+        e.make_end()
+    for s in starts:
+        s.make_start()
+
+def bfs_multi(draw: callable, grid: Grid, starts: Iterable[Spot], ends: Iterable[Spot]) -> Optional[Spot]:
+    """
+    Multi-source, multi-target Breadth-First Search.
+    The frontier is seeded with every start spot and the search stops at the first end spot it
+    reaches, which is the end spot nearest to any of the starts.
+    Args:
+        draw (callable): A function to call to update the Pygame window.
+        grid (Grid): The Grid object containing the spots.
+        starts (Iterable[Spot]): The starting spots.
+        ends (Iterable[Spot]): The candidate ending spots.
+    Returns:
+        Spot | None: The nearest end spot (its path is in grid.workspace.path), or None if none is reachable.
+    """
+    starts, ends, gen = _seed_sources(grid, starts, ends)
+    if not starts or not ends:
+        return None
+    ws = grid.workspace
+    seen, parent = ws.seen, ws.parent
+    goals = {e.index for e in ends}
+    queue = deque(starts)
+
+    while queue:
+        for event in poll_events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return None
+
+        current = queue.popleft()
+        ws.expanded += 1
+        if current.index in goals:
+            _draw_multi_path(grid, current, starts, ends, draw)
+            play_path_found()
+            return current
+
+        for neighbor in current.neighbors:
+            ni = neighbor.index
+            if seen[ni] != gen and not neighbor.is_barrier():
+                seen[ni] = gen
+                parent[ni] = current.index
+                queue.append(neighbor)
+                neighbor.make_open()
+        ws.frontier = len(queue)
+
+        draw()
+        current.make_closed()
+
+    return None
+
+def ucs_multi(draw: callable, grid: Grid, starts: Iterable[Spot], ends: Iterable[Spot]) -> Optional[Spot]:
+    """
+    Multi-source, multi-target Uniform Cost Search.
+    The frontier is seeded with every start spot and the search stops at the first end spot it
+    expands, which is the end spot nearest to any of the starts.
+    Args:
+        draw (callable): A function to call to update the Pygame window.
+        grid (Grid): The Grid object containing the spots.
+        starts (Iterable[Spot]): The starting spots.
+        ends (Iterable[Spot]): The candidate ending spots.
+    Returns:
+        Spot | None: The nearest end spot (its path is in grid.workspace.path), or None if none is reachable.
+    """
+    return astar_multi(draw, grid, starts, ends, heuristic=lambda p1, p2: 0)
+
+def astar_multi(draw: callable, grid: Grid, starts: Iterable[Spot], ends: Iterable[Spot],
+                heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float] = h_manhattan_distance) -> Optional[Spot]:
+    """
+    Multi-source, multi-target A*.
+    The frontier is seeded with every start spot and the estimate of a spot is the minimum of the
+    heuristic over all end spots, which stays admissible; the first end spot expanded is therefore
+    the nearest one.
+    Args:
+        draw (callable): A function to call to update the Pygame window.
+        grid (Grid): The Grid object containing the spots.
+        starts (Iterable[Spot]): The starting spots.
+        ends (Iterable[Spot]): The candidate ending spots.
+        heuristic (callable): An admissible estimate of the distance between two positions.
+    Returns:
+        Spot | None: The nearest end spot (its path is in grid.workspace.path), or None if none is reachable.
+    """
+    starts, ends, gen = _seed_sources(grid, starts, ends)
+    if not starts or not ends:
+        return None
+    ws = grid.workspace
+    seen, closed, g_score, parent = ws.seen, ws.closed, ws.g, ws.parent
+    spots = grid.spots
+    goals = {e.index for e in ends}
+    goal_positions = [e.get_position() for e in ends]
+
+    def h(p: tuple[int, int]) -> float:
+        return min(heuristic(p, q) for q in goal_positions)
+
+    count = 0
+    pq = []
+    for s in starts:
+        count += 1
+        heappush(pq, (h(s.get_position()), count, s.index))
+
+    while pq:
+        for event in poll_events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return None
+
+        i = heappop(pq)[2]
+        if closed[i] == gen:
+            continue
+        closed[i] = gen
+        ws.expanded += 1
+        current = spots[i]
+
+        if i in goals:
+            _draw_multi_path(grid, current, starts, ends, draw)
+            play_path_found()
+            return current
+
+        tentative_g = g_score[i] + 1
+        for neighbor in current.neighbors:
+            if neighbor.is_barrier():
+                continue
+            ni = neighbor.index
+            if seen[ni] != gen or tentative_g < g_score[ni]:
+                seen[ni] = gen
+                parent[ni] = i
+                g_score[ni] = tentative_g
+                count += 1
+                heappush(pq, (tentative_g + h(neighbor.get_position()), count, ni))
+                if ni not in goals:
+                    neighbor.make_open()
+        ws.frontier = len(pq)
+
+        draw()
+        current.make_closed()
+
+    return None
+
+class _SMANode:
+    """A cell held in SMA*'s bounded memory: one node per cell, linked into the search tree."""
+    __slots__ = ('index', 'g', 'f', 'depth', 'parent', 'children', 'forgotten', 'expanded', 'in_open', 'version')
+
+    def __init__(self, index: int, g: int, f: float, depth: int, parent: Optional["_SMANode"]):
+        self.index = index
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.parent = parent
+        self.children: set = set()
+        self.forgotten: dict[int, float] = {}  # cell -> backed-up f of successors dropped from memory
+        self.expanded = False
+        self.in_open = False
+        self.version = 0
+
+    def key(self) -> float:
+        # once expanded, a node is only worth revisiting for the successors it forgot
+        if not self.expanded:
+            return self.f
+        return min(self.forgotten.values(), default=float('inf'))
+
+def sma_star(draw: callable, grid: Grid, start: Spot, end: Spot, max_nodes: int = 10_000,
+             heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float] = h_manhattan_distance,
+             max_expansions: Optional[int] = None) -> bool:
+    """
+    Simplified Memory-bounded A* (SMA*).
+    At most max_nodes cells are kept in memory. When the budget is full, the worst leaf of the
+    search tree (highest f, shallowest on ties) is dropped and its f is backed up into its parent,
+    so the parent regenerates it only if that part of the tree becomes the most promising again.
+    The path is optimal whenever the budget can hold it; with a smaller budget the search
+    returns the best path it can keep in memory, or False if none fits. A tight budget makes
+    SMA* regenerate the same cells over and over, so max_expansions can cap the total work.
+    Args:
+        draw (callable): A function to call to update the Pygame window.
+        grid (Grid): The Grid object containing the spots.
+        start (Spot): The starting spot.
+        end (Spot): The ending spot.
+        max_nodes (int): The maximum number of cells kept in memory.
+        heuristic (callable): An admissible estimate of the distance between two positions.
+        max_expansions (int | None): Give up after this many expansions (None for no limit).
+    Returns:
+        bool: True if a path is found, False otherwise.
+    """
+    if start is None or end is None:
+        return False
+    if unreachable(grid, start, end):
+        return False
+    if max_nodes < 1:
+        raise ValueError(f"max_nodes must be at least 1, got {max_nodes}")
+
+    INF = float('inf')
+    ws = grid.workspace
+    ws.begin()
+    spots = grid.spots
+    end_pos = end.get_position()
+    count = 0
+    best_heap = []   # (key, -depth, count, version, node): lowest key, deepest first
+    worst_heap = []  # (-key, depth, count, version, node): highest key, shallowest first
+    nodes: dict[int, _SMANode] = {}
+
+    def push_open(node: _SMANode) -> None:
+        nonlocal count
+        node.version += 1
+        node.in_open = True
+        count += 1
+        k = node.key()
+        heappush(best_heap, (k, -node.depth, count, node.version, node))
+        heappush(worst_heap, (-k, node.depth, count, node.version, node))
+
+    def valid(entry: tuple) -> bool:
+        node = entry[4]
+        return node.in_open and entry[3] == node.version and nodes.get(node.index) is node
+
+    def forget(node: _SMANode) -> None:
+        del nodes[node.index]
+        node.in_open = False
+        spot = spots[node.index]
+        if spot != start and spot != end:
+            spot.reset()
+
+    def drop_leaf(node: _SMANode, keep: set) -> None:
+        parent = node.parent
+        parent.children.discard(node)
+        parent.forgotten[node.index] = node.key()
+        forget(node)
+        if parent not in keep:
+            push_open(parent)
+
+    def drop_worst_leaf(keep: set) -> bool:
+        skipped = []
+        dropped = False
+        while worst_heap:
+            entry = heappop(worst_heap)
+            if not valid(entry):
+                continue
+            node = entry[4]
+            if node.children or node.parent is None or node in keep:
+                skipped.append(entry)
+                continue
+            drop_leaf(node, keep)
+            dropped = True
+            break
+        for entry in skipped:
+            heappush(worst_heap, entry)
+        return dropped
+
+    def drop_subtree(node: _SMANode) -> None:
+        stack = list(node.children)
+        node.children = set()
+        while stack:
+            child = stack.pop()
+            stack.extend(child.children)
+            forget(child)
+
+    def compact() -> None:
+        # stale heap entries must not outgrow the node budget either
+        best_heap[:] = [e for e in best_heap if valid(e)]
+        worst_heap[:] = [e for e in worst_heap if valid(e)]
+        heapify(best_heap)
+        heapify(worst_heap)
+
+    root = _SMANode(start.index, 0, heuristic(start.get_position(), end_pos), 0, None)
+    nodes[root.index] = root
+    push_open(root)
+
+    while best_heap:
+        for event in poll_events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return False
+
+        entry = heappop(best_heap)
+        if not valid(entry):
+            continue
+        if entry[0] == INF:
+            break  # nothing left that fits in memory
+        if max_expansions is not None and ws.expanded >= max_expansions:
+            break
+        node = entry[4]
+        node.in_open = False
+        node.f = max(node.f, entry[0])
+        current = spots[node.index]
+        ws.expanded += 1
+
+        if current == end:
+            parent = ws.parent
+            while node.parent is not None:
+                parent[node.index] = node.parent.index
+                node = node.parent
+            parent[node.index] = -1
+            draw_path(grid, end, start, end, draw)
+            play_path_found()
+            return True
+
+        if node.expanded:
+            # regenerate only the forgotten successors that are still worth it
+            successors = [(spots[i], f) for i, f in node.forgotten.items() if f < INF]
+        else:
+            successors = [(n, 0) for n in current.neighbors if not n.is_barrier()]
+            node.expanded = True
+        g2 = node.g + 1
+        # best successors first, so that when memory runs out it is the worse siblings that get forgotten
+        successors = sorted((max(backed_up, node.f, g2 + heuristic(n.get_position(), end_pos)), n.index)
+                            for n, backed_up in successors)
+        for f2, ni in successors:
+            neighbor = spots[ni]
+            node.forgotten.pop(ni, None)
+            if f2 >= max_nodes:
+                # every step costs 1, so a path through this successor needs at least f2 + 1 cells in memory
+                node.forgotten[ni] = INF
+                continue
+            other = nodes.get(ni)
+            if other is not None:
+                if other.g <= g2:
+                    continue  # already in memory through a path at least as short
+                # found a shorter way to a remembered cell: move it (without its stale subtree) under node
+                drop_subtree(other)
+                old_parent = other.parent
+                old_parent.children.discard(other)
+                if not old_parent.children and old_parent is not node:
+                    push_open(old_parent)
+                other.g, other.f, other.depth, other.parent = g2, f2, node.depth + 1, node
+                other.forgotten, other.expanded = {}, False
+                child = other
+            else:
+                if len(nodes) >= max_nodes and not drop_worst_leaf({node}):
+                    node.forgotten[ni] = INF  # the budget is taken by this very branch
+                    continue
+                child = _SMANode(ni, g2, f2, node.depth + 1, node)
+                nodes[ni] = child
+            node.children.add(child)
+            push_open(child)
+            if neighbor != end:
+                neighbor.make_open()
+
+        if node.key() < INF:
+            push_open(node)
+        elif not node.children and node.parent is not None:
+            drop_leaf(node, set())  # dead end: backs up an infinite f into its parent
+
+        if len(best_heap) + len(worst_heap) > 8 * max_nodes:
+            compact()
+        ws.frontier = len(nodes)
+
+        draw()
+        if current != start and node.index in nodes:
+            current.make_closed()
+
+    return False
+
+
+def ara_star(draw: callable, grid: Grid, start: Spot, end: Spot,
+             heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float] = h_manhattan_distance,
+             weight: float = 3.0, weight_step: float = 0.5, time_budget: Optional[float] = None,
+             max_expansions: Optional[int] = None,
+             on_solution: Optional[Callable[[list[Spot], float, float], None]] = None) -> bool:
+    """
+    Anytime Repairing A* (ARA*).
+    Runs weighted A* (f = g + weight * h) with a large weight first, so a path is found quickly,
+    then lowers the weight by weight_step and searches again until it reaches 1 (plain A*, an
+    optimal path) or the budget runs out. Each iteration reuses the costs found so far: only the
+    cells whose cost improved since they were expanded (the INCONS list) and the open list of
+    the previous iteration are searched again.
+    The budget only applies once there is a path: the first iteration always runs to the end,
+    so a reachable goal is always found (False means unreachable, never out of budget).
+    Every time the path improves, it is drawn and published with a bound on how far it can be
+    from optimal: cost <= bound * optimal cost. The last one is kept in grid.workspace.path and
+    grid.workspace.bound.
+    Args:
+        draw (callable): A function to call to update the Pygame window.
+        grid (Grid): The Grid object containing the spots.
+        start (Spot): The starting spot.
+        end (Spot): The ending spot.
+        heuristic (callable): An admissible estimate of the distance between two positions.
+        weight (float): The weight of the heuristic in the first iteration (at least 1).
+        weight_step (float): How much the weight is lowered between iterations.
+        time_budget (float | None): Stop improving the path after this many seconds (None for no limit).
+        max_expansions (int | None): Stop improving the path after this many expansions (None for no limit).
+        on_solution (callable | None): Called with (path, cost, bound) for every improved path.
+    Returns:
+        bool: True if a path is found, False otherwise.
+    """
+    if start is None or end is None:
+        return False
+    if unreachable(grid, start, end):
+        return False
+    if weight < 1:
+        raise ValueError(f"weight must be at least 1, got {weight}")
+    if weight_step <= 0:
+        raise ValueError(f"weight_step must be positive, got {weight_step}")
+
+    INF = float('inf')
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    ws = grid.workspace
+    gen = ws.begin()
+    seen, closed, g_score, parent = ws.seen, ws.closed, ws.g, ws.parent
+    spots = grid.spots
+    end_pos = end.get_position()
+    goal = end.index
+    h_cache: dict[int, float] = {}
+
+    def h(i: int) -> float:
+        value = h_cache.get(i)
+        if value is None:
+            value = h_cache[i] = heuristic(spots[i].get_position(), end_pos)
+        return value
+
+    count = 0
+    open_heap = []     # (g + w * h, count, cell, g when pushed): stale once the cell's g improves
+    in_open: set[int] = set()
+    incons: set[int] = set()  # cells whose g improved after they were expanded in this iteration
+
+    def push(i: int) -> None:
+        nonlocal count
+        count += 1
+        heappush(open_heap, (g_score[i] + w * h(i), count, i, g_score[i]))
+        in_open.add(i)
+
+    def out_of_budget() -> bool:
+        return ((max_expansions is not None and ws.expanded >= max_expansions)
+                or (deadline is not None and time.perf_counter() >= deadline))
+
+    def improve_path(mark: int, budgeted: bool) -> bool:
+        """One weighted A* pass; False if the budget ran out before it finished."""
+        while open_heap:
+            f, _, i, g_pushed = open_heap[0]
+            if i not in in_open or g_pushed != g_score[i]:
+                heappop(open_heap)  # stale entry
+                continue
+            goal_g = g_score[goal] if seen[goal] == gen else INF
+            if goal_g <= f:
+                return True  # no open cell can lead to a path better than w * goal_g
+            if budgeted and out_of_budget():
+                return False
+            heappop(open_heap)
+            in_open.discard(i)
+            closed[i] = mark
+            ws.expanded += 1
+            current = spots[i]
+
+            tentative_g = g_score[i] + 1
+            for neighbor in current.neighbors:
+                ni = neighbor.index
+                if seen[ni] != gen or tentative_g < g_score[ni]:
+                    seen[ni] = gen
+                    parent[ni] = i
+                    g_score[ni] = tentative_g
+                    if closed[ni] == mark:
+                        incons.add(ni)  # expanded already: wait for the next iteration
+                    else:
+                        push(ni)
+                        if neighbor != end:
+                            neighbor.make_open()
+            ws.frontier = len(in_open) + len(incons)
+
+            draw()
+
+            if current != start and current != end:
+                current.make_closed()
+        return True
+
+    best_cost = INF
+    w = float(weight)
+    seen[start.index] = gen
+    g_score[start.index] = 0
+    parent[start.index] = -1
+    push(start.index)
+
+    while True:
+        mark = ws.fresh_stamp()  # an empty closed set, keeping g and parent
+        finished = improve_path(mark, budgeted=best_cost < INF)
+        if seen[goal] == gen:
+            # the parent links may already lead to the goal more cheaply than g(goal) says
+            path = ws.trace(goal)
+            cost = len(path) - 1
+            # every cell still to be searched bounds the optimal cost from below by its g + h,
+            # and a finished iteration also guarantees cost <= w * optimal cost
+            lower = min((g_score[i] + h(i) for i in in_open | incons), default=cost)
+            bound = cost / lower if lower > 0 else 1.0
+            if finished:
+                bound = min(bound, w)
+            if ws.bound is not None:
+                bound = min(bound, ws.bound * cost / best_cost)
+            bound = max(bound, 1.0)
+            if cost < best_cost:
+                for i in ws.path[1:-1]:
+                    spots[i].make_closed()  # repaint the previous, worse path
+                draw_path(grid, end, start, end, draw)
+                best_cost = cost
+                ws.bound = bound
+                if on_solution is not None:
+                    on_solution([spots[i] for i in ws.path], cost, bound)
+            ws.bound = bound
+            if bound <= 1:
+                break  # proven optimal
+        if not finished or w <= 1 or out_of_budget():
+            break
+        # tighten the weight and search again from the previous open list and INCONS
+        w = max(1.0, w - weight_step)
+        open_cells = in_open | incons
+        incons.clear()
+        in_open.clear()
+        open_heap.clear()
+        for i in open_cells:
+            push(i)
+        if not open_heap:
+            break  # the whole component was searched: the path is optimal
+
+    if best_cost < INF:
+        play_path_found()
+        return True
+    return False
@@ -2,7 +2,8 @@ from utils import *
 
 class Spot:
     # --- Constructor ---
-    def __init__(self, row: int, col: int, width: int, height: int, total_rows: int):
+    def __init__(self, row: int, col: int, width: int, height: int, total_rows: int,
+                 total_cols: int | None = None):
         """
         Initialize a spot in the grid.
         Args: 
@@ -11,6 +12,7 @@ class Spot:
             width (int): The width of the spot.
             height (int): The height of the spot.
             total_rows (int): Keeps track of the total number of rows in the grid (while avoiding global variables).
+            total_cols (int | None): The total number of columns in the grid (defaults to total_rows).
         """
         self.row: int = row
         self.col: int = col
@@ -21,6 +23,8 @@ class Spot:
         self.color: tuple = COLORS["WHITE"]
         self.neighbors: list = []
         self.total_rows: int = total_rows
+        self.total_cols: int = total_cols if total_cols is not None else total_rows
+        self.index: int = row * self.total_cols + col  # position in the grid's flat arrays
 
     def get_position(self) -> tuple[int, int]:
         """
@@ -153,7 +157,7 @@ class Spot:
         if self.row > 0 and not grid[self.row - 1][self.col].is_barrier():
             self.neighbors.append(grid[self.row - 1][self.col])
         # RIGHT
-        if self.col < self.total_rows - 1 and not grid[self.row][self.col + 1].is_barrier():
+        if self.col < self.total_cols - 1 and not grid[self.row][self.col + 1].is_barrier():
             self.neighbors.append(grid[self.row][self.col + 1])
         # LEFT
         if self.col > 0 and not grid[self.row][self.col - 1].is_barrier():